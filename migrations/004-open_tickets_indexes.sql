@@ -0,0 +1,10 @@
+-- Migration: Tune open_tickets_current indexes
+-- Description: Drops the index duplicating the ticket_id UNIQUE key and makes
+--              the open-ticket lookup (WHERE status = 'open') a covering index scan
+-- Author: Ray Caddick
+-- Date: 2026-10-15
+
+ALTER TABLE open_tickets_current
+    DROP INDEX idx_ticket_id,
+    DROP INDEX idx_status,
+    ADD INDEX idx_status_ticket_id (status, ticket_id);
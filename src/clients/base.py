@@ -1,4 +1,5 @@
 import requests
+from requests.adapters import HTTPAdapter
 
 
 class BaseClient:
@@ -7,9 +8,15 @@ class BaseClient:
         self.headers = headers
         self.params = params or {}
 
+        # Persistent session so TCP/TLS connections are reused across calls
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
     def get(self, endpoint, params={}):
         url = f"{self.base_url}{endpoint}"
-        response = requests.get(
+        response = self.session.get(
             url,
             headers=self.headers,
             params={**self.params, **params},
@@ -20,12 +27,14 @@ class BaseClient:
 
     def post(self, endpoint, data):
         url = f"{self.base_url}{endpoint}"
-        response = requests.post(url, json=data, headers=self.headers, timeout=(5, 30))
+        response = self.session.post(
+            url, json=data, headers=self.headers, timeout=(5, 30)
+        )
         response.raise_for_status()
         return response.json()
 
     def delete(self, endpoint):
         url = f"{self.base_url}{endpoint}"
-        response = requests.delete(url, headers=self.headers, timeout=(30, 60))
+        response = self.session.delete(url, headers=self.headers, timeout=(30, 60))
         response.raise_for_status()
         return response.json()
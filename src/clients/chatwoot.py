@@ -1,6 +1,9 @@
 from typing import Any, Dict, List, Optional
 
 from src.clients.base import BaseClient
+from src.utils.logging import setup_logger
+
+logger = setup_logger("chatwoot_client")
 
 
 class ChatwootClient(BaseClient):
@@ -61,7 +64,9 @@ class ChatwootClient(BaseClient):
 
             except Exception as e:
                 # Log but continue trying other variations
-                print(f"[ChatwootClient] Search failed for '{search_term}': {e}")
+                logger.warning(
+                    "[ChatwootClient] Search failed for '%s': %s", search_term, e
+                )
                 continue
 
         return None
@@ -1,6 +1,15 @@
+import hashlib
 from typing import Any, Dict, List, Optional
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.utils.cache import TTLCache
+
+# Meta keeps uploaded media for 30 days; stop reusing ids a day early
+MEDIA_ID_TTL = 29 * 24 * 60 * 60
 
 
 class MetaWhatsappClient:
@@ -34,6 +43,37 @@ class MetaWhatsappClient:
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json",
         }
+        # access token is sent via params for Graph API compatibility
+        self._auth_params = {"access_token": self.access_token}
+        self._media_url = self._url(f"{self.phone_number_id}/media")
+        self._messages_url = self._url(f"{self.phone_number_id}/messages")
+
+        # Persistent session so the TLS connection to graph.facebook.com is
+        # reused across the upload + send of a ticket. Only failures where
+        # Meta didn't process the request are retried (connection errors and
+        # 429s); retrying a 5xx on a POST could deliver a message twice.
+        self.session = requests.Session()
+        retry = Retry(
+            total=3,
+            connect=3,
+            read=0,
+            status=3,
+            status_forcelist=(429,),
+            allowed_methods=frozenset({"GET", "POST"}),
+            backoff_factor=0.3,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+        self.session.mount("https://", adapter)
+
+        # Upload responses keyed by content digest, so re-sending the same
+        # ticket reuses its media id instead of uploading it again
+        self._uploads = TTLCache(ttl=MEDIA_ID_TTL, maxsize=256)
+
+    def close(self):
+        """Close the pooled connections held by the session."""
+        self.session.close()
 
     def _url(self, endpoint: str) -> str:
         return f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
@@ -45,9 +85,16 @@ class MetaWhatsappClient:
         Upload media to Meta and return the API response (contains media id).
         Uses multipart/form-data as required by the Graph API.
 
+        Uploads are cached by content, so uploading identical bytes again
+        returns the earlier response without calling the API.
+
         Example response: {"id": "<media_id>"}
         """
-        url = self._url(f"{self.phone_number_id}/media")
+        digest = hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
+        cache_key = (digest, mime_type)
+        cached = self._uploads.get(cache_key)
+        if cached is not None:
+            return cached
 
         files = {
             "file": (filename, file_bytes, mime_type),
@@ -59,36 +106,36 @@ class MetaWhatsappClient:
             "type": mime_type,
         }
 
-        params = {"access_token": self.access_token}
-
-        resp = requests.post(
-            url,
+        resp = self.session.post(
+            self._media_url,
             files=files,
             data=data,  # Add form data
-            params=params,
+            params=self._auth_params,
             timeout=self.timeout,
         )
         resp.raise_for_status()
-        return resp.json()
+        result = orjson.loads(resp.content)
+
+        if result.get("id"):
+            self._uploads.set(cache_key, result)
+        return result
 
     def send_message(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """
         Send a raw message payload to the Graph API messages endpoint.
         Caller constructs the payload (templates, image, document, text).
         """
-        endpoint = f"{self.phone_number_id}/messages"
-        url = self._url(endpoint)
-        # send access token via params for Graph API compatibility
-        params = {"access_token": self.access_token}
-        resp = requests.post(
-            url,
-            json=payload,
+        # Serialized with orjson straight to UTF-8 bytes; _json_headers already
+        # sets the JSON Content-Type
+        resp = self.session.post(
+            self._messages_url,
+            data=orjson.dumps(payload),
             headers=self._json_headers,
-            params=params,
+            params=self._auth_params,
             timeout=self.timeout,
         )
         resp.raise_for_status()
-        return resp.json()
+        return orjson.loads(resp.content)
 
     # Convenience wrappers -------------------------------------------------
     def send_text(
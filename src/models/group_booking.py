@@ -1,8 +1,16 @@
+import re
+
 import phonenumbers
 from phonenumbers import NumberParseException
 
 from src.repositories.mysql import get_db_connection
 from src.services.barcode import generate_barcode
+from src.utils.phone import za_national
+
+# Fast accept for ZA 06x/07x/080-087 numbers (with spaces and dashes removed),
+# all of which phonenumbers treats as valid. Anything else, including the
+# partially allocated 088/089 ranges, goes through phonenumbers.
+_ZA_NUMBER_RE = re.compile(r"^(?:\+27|27|0)?([67]\d{8}|8[0-7]\d{7})$")
 
 
 class GroupBooking:
@@ -14,6 +22,7 @@ class GroupBooking:
         mobile_number=None,
         visit_date=None,
         barcode=None,
+        validate=True,
     ):
         self.id = id
         self.group_name = group_name
@@ -21,7 +30,7 @@ class GroupBooking:
         self.mobile_number = mobile_number
         self.visit_date = visit_date
         self.barcode = barcode
-        if mobile_number:
+        if mobile_number and validate:
             self.validate_mobile_number()  # Run validation on init if provided
 
     def validate(self):
@@ -36,6 +45,13 @@ class GroupBooking:
 
     def validate_mobile_number(self):
         """Validate and normalize mobile number."""
+        number = str(self.mobile_number).strip()
+
+        match = _ZA_NUMBER_RE.match(number.replace(" ", "").replace("-", ""))
+        if match:
+            self.mobile_number = "27" + match.group(1)
+            return
+
         try:
             parsed = phonenumbers.parse(self.mobile_number, "ZA")
             if not phonenumbers.is_valid_number(parsed):
@@ -77,10 +93,7 @@ class GroupBooking:
         """Formatter for display (national format)."""
         if not self.mobile_number:
             return ""
-        parsed = phonenumbers.parse(self.mobile_number, "ZA")
-        return phonenumbers.format_number(
-            parsed, phonenumbers.PhoneNumberFormat.NATIONAL
-        )
+        return za_national(self.mobile_number)
 
     def to_dict(self):
         """Convert to dict for serialization or DB ops."""
@@ -97,6 +110,8 @@ class GroupBooking:
     @classmethod
     def from_dict(cls, data):
         """Create instance from DB row dict."""
+        # Stored numbers are already validated and normalized, so skip the
+        # phonenumbers round trip for every row loaded
         return cls(
             id=data.get("id"),
             group_name=data.get("group_name"),
@@ -104,6 +119,7 @@ class GroupBooking:
             mobile_number=data.get("mobile_number"),
             visit_date=data.get("visit_date"),
             barcode=data.get("barcode"),
+            validate=False,
         )
 
     @classmethod
@@ -171,7 +187,7 @@ class GroupBooking:
     ):
         """
         Update the instance with new values, validate, save, and return
-        the fresh updated instance (or None on failure).
+        the updated instance (or None on failure).
         """
         if group_name is not None:
             self.group_name = group_name
@@ -186,8 +202,9 @@ class GroupBooking:
 
         success = self.save()
         if success:
-            # Reload fresh from DB and return it
-            return self.__class__.get_by_id(self.id)
+            # The instance already holds exactly what was written (validated
+            # and normalized), so there's no need to re-read the row
+            return self
         return None
 
     @classmethod
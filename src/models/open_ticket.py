@@ -1,4 +1,4 @@
-import json
+import orjson
 
 from src.repositories.mysql import get_db_connection
 
@@ -23,111 +23,128 @@ class OpenTicket:
         self.closed_at = closed_at
 
     @classmethod
-    def get_open_ticket_ids(cls):
-        with get_db_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    "SELECT ticket_id FROM open_tickets_current WHERE status = 'open'"
-                )
-                return {row["ticket_id"] for row in cursor.fetchall()}
+    def bulk_upsert_open(cls, events):
+        """
+        Apply a batch of open ticket observations in a single transaction.
 
-    @classmethod
-    def upsert_open(cls, ticket_id, semantic_hash, receipt_json, observed_at):
-        receipt_json_str = json.dumps(receipt_json)
+        Each event is a dict with ticket_id, semantic_hash, receipt_json and
+        observed_at. Unseen tickets are created, tickets whose semantic hash
+        changed are modified, and unchanged tickets are skipped. Events are
+        applied in order, so a ticket may appear more than once in a batch.
+        """
+        if not events:
+            return
 
         with get_db_connection() as conn:
             with conn.cursor() as cursor:
+                ticket_ids = list({evt["ticket_id"] for evt in events})
+                placeholders = ", ".join(["%s"] * len(ticket_ids))
                 cursor.execute(
-                    """
-                    SELECT semantic_hash FROM open_tickets_current
-                    WHERE ticket_id = %s
+                    f"""
+                    SELECT ticket_id, semantic_hash FROM open_tickets_current
+                    WHERE ticket_id IN ({placeholders})
                     """,
-                    (ticket_id,),
+                    ticket_ids,
                 )
-                row = cursor.fetchone()
-
-                if row is None:
-                    cursor.execute(
-                        """
-                        INSERT INTO open_tickets_current
-                        (ticket_id, semantic_hash, status, receipt_json, opened_at, last_modified_at)
-                        VALUES (%s, %s, 'open', %s, %s, %s)
-                        """,
+                known_hashes = {
+                    row["ticket_id"]: row["semantic_hash"] for row in cursor.fetchall()
+                }
+
+                current_rows = []
+                history_rows = []
+                for evt in events:
+                    ticket_id = evt["ticket_id"]
+                    semantic_hash = evt["semantic_hash"]
+
+                    if ticket_id not in known_hashes:
+                        event_type = "created"
+                    elif known_hashes[ticket_id] != semantic_hash:
+                        event_type = "modified"
+                    else:
+                        continue
+
+                    known_hashes[ticket_id] = semantic_hash
+                    receipt_json_str = orjson.dumps(evt["receipt_json"]).decode()
+                    observed_at = evt["observed_at"]
+
+                    current_rows.append(
                         (
                             ticket_id,
                             semantic_hash,
+                            "open",
                             receipt_json_str,
                             observed_at,
                             observed_at,
-                        ),
+                        )
                     )
-                    event_type = "created"
-
-                elif row["semantic_hash"] != semantic_hash:
-                    cursor.execute(
-                        """
-                        UPDATE open_tickets_current
-                        SET semantic_hash = %s,
-                            receipt_json = %s,
-                            last_modified_at = %s
-                        WHERE ticket_id = %s
-                        """,
+                    history_rows.append(
                         (
+                            ticket_id,
                             semantic_hash,
+                            event_type,
                             receipt_json_str,
                             observed_at,
-                            ticket_id,
-                        ),
+                        )
                     )
-                    event_type = "modified"
-                else:
+
+                if not current_rows:
                     return
 
-                cursor.execute(
+                # opened_at is only written for new rows; existing rows keep theirs
+                cursor.executemany(
+                    """
+                    INSERT INTO open_tickets_current
+                    (ticket_id, semantic_hash, status, receipt_json, opened_at, last_modified_at)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE
+                        semantic_hash = VALUES(semantic_hash),
+                        receipt_json = VALUES(receipt_json),
+                        last_modified_at = VALUES(last_modified_at)
+                    """,
+                    current_rows,
+                )
+                cursor.executemany(
                     """
                     INSERT INTO open_tickets_history
                     (ticket_id, semantic_hash, event_type, receipt_json, observed_at)
                     VALUES (%s, %s, %s, %s, %s)
                     """,
-                    (
-                        ticket_id,
-                        semantic_hash,
-                        event_type,
-                        receipt_json_str,
-                        observed_at,
-                    ),
+                    history_rows,
                 )
 
                 conn.commit()
 
     @classmethod
     def close_missing(cls, heartbeat_ids, observed_at):
-        open_ids = cls.get_open_ticket_ids()
-        to_close = open_ids - heartbeat_ids
-
-        if not to_close:
-            return
-
         with get_db_connection() as conn:
             with conn.cursor() as cursor:
-                for ticket_id in to_close:
-                    cursor.execute(
-                        """
-                        UPDATE open_tickets_current
-                        SET status = 'closed',
-                            closed_at = %s
-                        WHERE ticket_id = %s
-                        """,
-                        (observed_at, ticket_id),
-                    )
-                    cursor.execute(
-                        """
-                        INSERT INTO open_tickets_history
-                        (ticket_id, semantic_hash, event_type, observed_at)
-                        SELECT ticket_id, semantic_hash, 'closed', %s
-                        FROM open_tickets_current
-                        WHERE ticket_id = %s
-                        """,
-                        (observed_at, ticket_id),
-                    )
+                cursor.execute(
+                    "SELECT ticket_id FROM open_tickets_current WHERE status = 'open'"
+                )
+                open_ids = {row["ticket_id"] for row in cursor.fetchall()}
+                to_close = list(open_ids - heartbeat_ids)
+
+                if not to_close:
+                    return
+
+                placeholders = ", ".join(["%s"] * len(to_close))
+                cursor.execute(
+                    f"""
+                    UPDATE open_tickets_current
+                    SET status = 'closed',
+                        closed_at = %s
+                    WHERE ticket_id IN ({placeholders})
+                    """,
+                    (observed_at, *to_close),
+                )
+                cursor.execute(
+                    f"""
+                    INSERT INTO open_tickets_history
+                    (ticket_id, semantic_hash, event_type, observed_at)
+                    SELECT ticket_id, semantic_hash, 'closed', %s
+                    FROM open_tickets_current
+                    WHERE ticket_id IN ({placeholders})
+                    """,
+                    (observed_at, *to_close),
+                )
                 conn.commit()
@@ -1,8 +1,134 @@
+import os
+import queue
+import threading
+import time
 from contextlib import contextmanager
 
 import pymysql
 
-from config.settings import MYSQL_DB, MYSQL_HOST, MYSQL_PASSWORD, MYSQL_USER
+from config.settings import (
+    MYSQL_DB,
+    MYSQL_HOST,
+    MYSQL_MAX_OVERFLOW,
+    MYSQL_PASSWORD,
+    MYSQL_POOL_RECYCLE,
+    MYSQL_POOL_SIZE,
+    MYSQL_POOL_TIMEOUT,
+    MYSQL_USER,
+)
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of PyMySQL connections.
+
+    Up to ``pool_size`` idle connections are kept for reuse. Under burst load a
+    further ``max_overflow`` connections may be opened; these are closed when
+    released instead of being returned to the pool.
+    """
+
+    def __init__(
+        self,
+        pool_size=6,
+        max_overflow=12,
+        recycle=1800,
+        timeout=30,
+        pre_ping=True,
+    ):
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.recycle = recycle
+        self.timeout = timeout
+        self.pre_ping = pre_ping
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._idle = queue.LifoQueue(maxsize=self.pool_size)
+        self._slots = threading.BoundedSemaphore(self.pool_size + self.max_overflow)
+
+    def _connect(self):
+        connection = pymysql.connect(
+            host=MYSQL_HOST,
+            user=MYSQL_USER,
+            password=MYSQL_PASSWORD,
+            database=MYSQL_DB,
+            cursorclass=pymysql.cursors.DictCursor,
+        )
+        return connection, time.monotonic()
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.close()
+        except pymysql.MySQLError:
+            pass
+
+    def _is_usable(self, connection, created_at):
+        if self.recycle and time.monotonic() - created_at > self.recycle:
+            return False
+        if self.pre_ping:
+            try:
+                connection.ping(reconnect=False)
+            except pymysql.MySQLError:
+                return False
+        return True
+
+    def acquire(self):
+        """Check out a connection, returning ``(connection, created_at)``."""
+        # Connections inherited from a parent process (e.g. a preloading WSGI
+        # server) share sockets with it, so drop them without closing.
+        if os.getpid() != self._pid:
+            self._reset()
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise pymysql.err.OperationalError(
+                f"MySQL connection pool exhausted after {self.timeout}s"
+            )
+
+        try:
+            while True:
+                try:
+                    connection, created_at = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+
+                if self._is_usable(connection, created_at):
+                    return connection, created_at
+                self._close(connection)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, connection, created_at, discard=False):
+        """Return a connection to the pool, or close it if it cannot be reused."""
+        try:
+            if not discard:
+                try:
+                    # End any open transaction so the next borrower does not
+                    # read from a stale snapshot or inherit uncommitted writes.
+                    connection.rollback()
+                except pymysql.MySQLError:
+                    discard = True
+
+            if discard:
+                self._close(connection)
+                return
+
+            try:
+                self._idle.put_nowait((connection, created_at))
+            except queue.Full:
+                self._close(connection)
+        finally:
+            self._slots.release()
+
+
+pool = ConnectionPool(
+    pool_size=MYSQL_POOL_SIZE,
+    max_overflow=MYSQL_MAX_OVERFLOW,
+    recycle=MYSQL_POOL_RECYCLE,
+    timeout=MYSQL_POOL_TIMEOUT,
+)
 
 
 @contextmanager
@@ -10,15 +136,16 @@ def get_db_connection():
     """Reusable context manager for MySQL database connections.
 
     Import and use this in any model or service that needs DB access.
+    Connections are borrowed from a shared pool, so concurrent requests each
+    get their own connection without paying the connect handshake every time.
+    Uncommitted work is rolled back when the connection is returned.
     """
-    connection = pymysql.connect(
-        host=MYSQL_HOST,
-        user=MYSQL_USER,
-        password=MYSQL_PASSWORD,
-        database=MYSQL_DB,
-        cursorclass=pymysql.cursors.DictCursor,
-    )
+    connection, created_at = pool.acquire()
+    discard = False
     try:
         yield connection
+    except BaseException:
+        discard = True
+        raise
     finally:
-        connection.close()
+        pool.release(connection, created_at, discard=discard)
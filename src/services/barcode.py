@@ -1,6 +1,9 @@
 import random
 import time
 
+# EAN-13 weights for the first 12 digits: odd positions x1, even positions x3
+_EAN13_WEIGHTS = (1, 3) * 6
+
 
 def calculate_ean13_check_digit(barcode_12_digits):
     """Calculate the check digit for EAN-13 barcode."""
@@ -13,9 +16,12 @@ def calculate_ean13_check_digit(barcode_12_digits):
     # 3. Sum all results
     # 4. Check digit = (10 - (sum % 10)) % 10
 
-    odd_sum = sum(int(barcode_12_digits[i]) for i in range(0, 12, 2))
-    even_sum = sum(int(barcode_12_digits[i]) for i in range(1, 12, 2))
-    total = odd_sum + (even_sum * 3)
+    # Work on the ASCII bytes so each digit is just (byte - ord("0"))
+    digits = barcode_12_digits.encode("ascii")
+    if not digits.isdigit():
+        raise ValueError("Barcode must contain only digits")
+
+    total = sum((d - 48) * w for d, w in zip(digits, _EAN13_WEIGHTS))
     check_digit = (10 - (total % 10)) % 10
 
     return check_digit
@@ -35,10 +41,9 @@ def generate_barcode(prefix="200"):
         str: 13-digit EAN-13 barcode
     """
     # Generate 9 unique digits using timestamp + random
-    timestamp_part = str(int(time.time() * 1000))[
-        -6:
-    ]  # Last 6 digits of millisecond timestamp
-    random_part = str(random.randint(0, 999)).zfill(3)  # 3 random digits
+    # Last 6 digits of the millisecond timestamp, kept in integer arithmetic
+    timestamp_part = f"{time.time_ns() // 1_000_000 % 1_000_000:06d}"
+    random_part = f"{random.randrange(1000):03d}"  # 3 random digits
 
     # Combine: prefix (3) + timestamp (6) + random (3) = 12 digits
     barcode_without_check = prefix + timestamp_part + random_part
@@ -8,6 +8,35 @@ from config.settings import (
 )
 from src.clients.chatwoot import ChatwootClient
 from src.models.group_booking import GroupBooking
+from src.utils.logging import setup_logger
+
+logger = setup_logger("chatwoot")
+
+# Message bodies shown in Chatwoot for the WhatsApp templates, built once and
+# formatted per send
+GROUP_TICKET_CONTENT = """Hi {contact_name}
+
+Your group vehicle ticket is attached.
+
+Please share *THIS* ticket with your group members and ensure the driver of each vehicle presents it for scanning upon arrival. It can be shown on a phone and does not need to be printed.
+
+The passenger count in each vehicle presenting this ticket will be added to your group for invoicing.
+
+Any vehicle without a group ticket will be charged the normal fee at the gate. No exceptions.
+
+*ALL VEHICLES*, including taxi drop-offs, *MUST remain in the queue* and enter the park *BEFORE* passengers disembark. *Strictly no drop-offs outside the gate.*
+
+We wish you all a blessed day at the Farmyard."""
+
+HIDE_EVENT_FAILURE_CONTENT = """Morning Team,
+The system was unable to hide today's Quicket event automatically.
+⚠️ Action required:
+Please log in to Quicket and manually hide the event for today to prevent additional sales occuring after the Loyverse inventory update.
+Details:
+- Event: *{event_id}*
+- Event Url: *{event_url}*
+Once the event is hidden, you may proceed with the normal manual inventory update workflow.
+— The Farmyard Park Automation System 🤖"""
 
 
 class ChatwootService:
@@ -121,19 +150,7 @@ class ChatwootService:
             assert conversation_id is not None, "Conversation ID should not be None"
 
             # Step 3: Build template message content
-            template_content = f"""Hi {contact_name}
-
-Your group vehicle ticket is attached.
-
-Please share *THIS* ticket with your group members and ensure the driver of each vehicle presents it for scanning upon arrival. It can be shown on a phone and does not need to be printed.
-
-The passenger count in each vehicle presenting this ticket will be added to your group for invoicing.
-
-Any vehicle without a group ticket will be charged the normal fee at the gate. No exceptions.
-
-*ALL VEHICLES*, including taxi drop-offs, *MUST remain in the queue* and enter the park *BEFORE* passengers disembark. *Strictly no drop-offs outside the gate.*
-
-We wish you all a blessed day at the Farmyard."""
+            template_content = GROUP_TICKET_CONTENT.format(contact_name=contact_name)
 
             # Step 4: Prepare template message payload
             message_payload = {
@@ -177,7 +194,7 @@ We wish you all a blessed day at the Farmyard."""
                 except Exception:
                     pass
 
-            print(f"Error sending template via Chatwoot: {error_detail}")
+            logger.error("Error sending template via Chatwoot: %s", error_detail)
             return {
                 "success": False,
                 "error": f"Chatwoot API error: {error_detail}",
@@ -253,15 +270,9 @@ We wish you all a blessed day at the Farmyard."""
             assert conversation_id is not None, "Conversation ID should not be None"
 
             # Step 3: Build template message content
-            template_content = f"""Morning Team,
-    The system was unable to hide today's Quicket event automatically.
-    ⚠️ Action required:
-    Please log in to Quicket and manually hide the event for today to prevent additional sales occuring after the Loyverse inventory update.
-    Details:
-    - Event: *{event_id}*
-    - Event Url: *{event_url}*
-    Once the event is hidden, you may proceed with the normal manual inventory update workflow.
-    — The Farmyard Park Automation System 🤖"""
+            template_content = HIDE_EVENT_FAILURE_CONTENT.format(
+                event_id=event_id, event_url=event_url
+            )
 
             # Step 4: Prepare template message payload
             message_payload = {
@@ -302,8 +313,9 @@ We wish you all a blessed day at the Farmyard."""
                 except Exception:
                     pass
 
-            print(
-                f"Error sending quicketbot hide event failure alert via Chatwoot: {error_detail}"
+            logger.error(
+                "Error sending quicketbot hide event failure alert via Chatwoot: %s",
+                error_detail,
             )
             return {
                 "success": False,
@@ -3,7 +3,15 @@ from typing import Optional
 from config.settings import WHATSAPP_ACCESS_TOKEN, WHATSAPP_PHONE_NUMBER_ID
 from src.clients.meta_whatsapp import MetaWhatsappClient
 from src.models.group_booking import GroupBooking
-from src.services.pdf import convert_pdf_to_jpeg, generate_ticket_pdf
+from src.services.pdf import (
+    convert_pdf_to_jpeg,
+    generate_ticket_pdf,
+    get_ticket_image_bytes,
+)
+from src.utils.date import format_long_date
+from src.utils.logging import setup_logger
+
+logger = setup_logger("meta_whatsapp")
 
 
 class MetaWhatsappService:
@@ -86,12 +94,12 @@ class MetaWhatsappService:
         Returns:
             dict: Success/failure response with message_id
         """
-        # Step 1: Convert PDF to JPEG
-        if pdf_bytes is None:
-            pdf_bytes = generate_ticket_pdf(booking)
-
+        # Step 1: Convert PDF to JPEG (cached per ticket unless a PDF is given)
         try:
-            jpeg_bytes = convert_pdf_to_jpeg(pdf_bytes)
+            if pdf_bytes is None:
+                jpeg_bytes = get_ticket_image_bytes(booking)
+            else:
+                jpeg_bytes = convert_pdf_to_jpeg(pdf_bytes)
         except Exception as e:
             return {
                 "success": False,
@@ -121,7 +129,7 @@ class MetaWhatsappService:
                 except Exception:
                     pass
 
-            print(f"Error uploading JPEG: {error_msg}")
+            logger.error("Error uploading JPEG: %s", error_msg)
             return {
                 "success": False,
                 "error": f"Failed to upload JPEG to WhatsApp: {error_msg}",
@@ -175,7 +183,9 @@ class MetaWhatsappService:
                 except Exception:
                     pass
 
-            print(f"Error sending group vehicle ticket JPEG template: {error_msg}")
+            logger.error(
+                "Error sending group vehicle ticket JPEG template: %s", error_msg
+            )
             return {"success": False, "error": error_msg}
 
     def send_ticket_delivery(
@@ -225,20 +235,14 @@ class MetaWhatsappService:
                 except Exception:
                     pass
 
-            print(f"Error uploading PDF: {error_msg}")
+            logger.error("Error uploading PDF: %s", error_msg)
             return {
                 "success": False,
                 "error": f"Failed to upload PDF to WhatsApp: {error_msg}",
             }
 
         # Step 2: Format the date
-        from datetime import datetime
-
-        try:
-            date_obj = datetime.strptime(str(booking.visit_date), "%Y-%m-%d")
-            formatted_date = date_obj.strftime("%A, %d %B %Y")
-        except Exception:
-            formatted_date = str(booking.visit_date)
+        formatted_date = format_long_date(booking.visit_date)
 
         # Step 3: Build template components
         components = [
@@ -287,7 +291,7 @@ class MetaWhatsappService:
                 except Exception:
                     pass
 
-            print(f"Error sending ticket delivery template: {error_msg}")
+            logger.error("Error sending ticket delivery template: %s", error_msg)
             return {"success": False, "error": error_msg}
 
     def send_quicketbot_hide_event_failure(
@@ -352,5 +356,7 @@ class MetaWhatsappService:
                 except Exception:
                     pass
 
-            print(f"Error sending quicketbot hide event failure alert: {error_msg}")
+            logger.error(
+                "Error sending quicketbot hide event failure alert: %s", error_msg
+            )
             return {"success": False, "error": error_msg}
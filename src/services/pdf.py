@@ -1,17 +1,61 @@
+import functools
+import hashlib
 from io import BytesIO
 
-import fitz
-from PIL import Image
 from reportlab.graphics.barcode import code128
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
-from reportlab.lib.utils import ImageReader
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfgen import canvas
 
 from config.constants import IMAGE_DIR
 from src.models.group_booking import GroupBooking
+from src.utils.date import format_long_date
+from src.utils.logging import setup_logger
+
+logger = setup_logger("pdf")
+
+LOGO_PATH = IMAGE_DIR / "Farmyard_Logo.jpg"
+
+# Part of the ticket ETag; bump when the ticket layout changes so browsers
+# holding an old ticket fetch the new one
+TICKET_LAYOUT_VERSION = 1
+
+# Farmyard brand colors - green and earth tones
+PRIMARY_COLOR = colors.HexColor("#2D5F3F")  # Dark green
+ACCENT_COLOR = colors.HexColor("#8BC34A")  # Light green
+TEXT_DARK = colors.HexColor("#333333")
+TEXT_BLACK = colors.HexColor("#000000")
+TEXT_WHITE = colors.HexColor("#FFFFFF")
+TEXT_LIGHT = colors.HexColor("#666666")
+BACKGROUND_GRAY = colors.HexColor("#F5F5F5")
+BORDER_GRAY = colors.HexColor("#DDDDDD")
+WATERMARK_COLOR = colors.Color(0.8, 0.8, 0.8, alpha=0.35)
+
+HEADER_HEIGHT = 44.5 * mm
+FOOTER_HEIGHT = 35 * mm
+LOGO_SIZE = 75 * mm
+
+INSTRUCTIONS = (
+    "• This ticket is valid for ONE VEHICLE entrance on the date shown above",
+    "• Driver must present this ticket at the entrance for scanning",
+    "• Entry is strictly in queue order - no priority entrance available",
+    "• No entry after 3:00 PM  •  Alcohol strictly prohibited  •  No music permitted",
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _logo_path():
+    """
+    Logo path as a string, checked once per process (None if missing).
+
+    The logo is drawn by filename rather than through an ImageReader: for a
+    JPEG file ReportLab embeds the DCT stream as-is and names the image from
+    the path, where an ImageReader is decoded to RGB and hashed on every
+    render just to name it.
+    """
+    return str(LOGO_PATH) if LOGO_PATH.is_file() else None
 
 
 def fit_font_size(text, font_name, max_width, max_font=24, min_font=8, step=0.5):
@@ -50,48 +94,81 @@ def split_long_text(text):
     return list(best)
 
 
+def ticket_etag(booking: GroupBooking) -> str:
+    """
+    ETag for a booking's ticket, derived from the fields drawn on it
+
+    Lets routes answer conditional requests without rendering the PDF.
+
+    Args:
+        booking: GroupBooking with group_name, visit_date, barcode
+
+    Returns:
+        str: Hex digest identifying the ticket's content
+    """
+    key = (
+        f"{TICKET_LAYOUT_VERSION}|{booking.barcode}|"
+        f"{booking.group_name}|{booking.visit_date}"
+    )
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
 def generate_ticket_pdf(booking: GroupBooking):
     """
     Generate a professional PDF ticket for a group booking
 
+    Rendered tickets are cached per process, keyed on the fields drawn on the
+    ticket, so an edited booking simply renders (and caches) a new PDF.
+
     Args:
         booking: Dict with keys: group_name, visit_date, barcode
 
     Returns:
         bytes: PDF file as bytes
     """
-    # Create PDF in memory
-    buffer = BytesIO()
+    return _render_ticket_pdf(*_ticket_key(booking))
 
-    # Create canvas (A4 size)
-    c = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
 
-    # Define colors (Farmyard brand colors - green and earth tones)
-    primary_color = colors.HexColor("#2D5F3F")  # Dark green
-    accent_color = colors.HexColor("#8BC34A")  # Light green
-    text_dark = colors.HexColor("#333333")
-    text_black = colors.HexColor("#000000")
-    text_black = colors.HexColor("#000000")
-    text_white = colors.HexColor("#FFFFFF")
-    text_light = colors.HexColor("#666666")
-    background_gray = colors.HexColor("#F5F5F5")
+def _ticket_key(booking: GroupBooking):
+    """
+    Cache key for a rendered ticket: the fields drawn on it, as they are
+    drawn (str), so a date loaded from the DB and the same date posted from
+    the form share an entry.
+    """
+    return str(booking.barcode), str(booking.group_name), str(booking.visit_date)
+
+
+@functools.lru_cache(maxsize=256)
+def _render_ticket_pdf(barcode, group_name, visit_date):
+    booking = GroupBooking(group_name=group_name, visit_date=visit_date, barcode=barcode)
+
+    # Take the PDF bytes straight from the canvas; saving into a BytesIO
+    # would only copy them into a buffer and back out again
+    c = canvas.Canvas(None, pagesize=A4)
+    _draw_ticket(c, booking)
+
+    return c.getpdfdata()
+
+
+def _draw_ticket(c: canvas.Canvas, booking: GroupBooking):
+    """Draw the ticket onto the canvas and finish the page."""
+    width, height = A4
 
     # HEADER - Reduced height and improved design
-    header_height = 44.5 * mm
+    header_height = HEADER_HEIGHT
 
     # Main header background
-    c.setFillColor(accent_color)
+    c.setFillColor(ACCENT_COLOR)
     c.rect(0, height - header_height, width, header_height, fill=1, stroke=0)
 
     # Decorative wave pattern at bottom of header
-    c.setFillColor(primary_color)
+    c.setFillColor(PRIMARY_COLOR)
 
     # Simple decorative bottom border
     c.rect(0, height - header_height, width, 3.1 * mm, fill=1, stroke=0)
 
     # Logo section - white circle background FIRST, then logo on top
-    logo_size = 75 * mm
+    logo_size = LOGO_SIZE
     logo_center_x = width - logo_size / 2
     logo_center_y = height - 28 * mm
 
@@ -101,11 +178,10 @@ def generate_ticket_pdf(booking: GroupBooking):
 
     # Now draw logo ON TOP of white circle
     try:
-        logo_path = IMAGE_DIR / "Farmyard_Logo.jpg"
-        if logo_path.exists():
-            logo = ImageReader(str(logo_path))
+        logo_path = _logo_path()
+        if logo_path:
             c.drawImage(
-                logo,
+                logo_path,
                 logo_center_x - logo_size / 2,
                 logo_center_y - logo_size + 127,
                 width=logo_size,
@@ -115,13 +191,13 @@ def generate_ticket_pdf(booking: GroupBooking):
             )
         else:
             # Fallback text
-            c.setFillColor(primary_color)
+            c.setFillColor(PRIMARY_COLOR)
             c.setFont("Helvetica-Bold", 14)
             c.drawCentredString(logo_center_x, logo_center_y, "FARMYARD PARK")
     except Exception as e:
-        print(f"Logo error: {e}")
+        logger.error("Logo error: %s", e)
         # Fallback text
-        c.setFillColor(primary_color)
+        c.setFillColor(PRIMARY_COLOR)
         c.setFont("Helvetica-Bold", 14)
         c.drawCentredString(logo_center_x, logo_center_y, "FARMYARD PARK")
 
@@ -142,14 +218,14 @@ def generate_ticket_pdf(booking: GroupBooking):
     content_start = height - header_height - 15 * mm
 
     # Light background for main content
-    c.setFillColor(background_gray)
+    c.setFillColor(BACKGROUND_GRAY)
     c.rect(
         30 * mm, content_start - 110 * mm, width - 60 * mm, 110 * mm, fill=1, stroke=0
     )
 
     # White content box
     c.setFillColor(colors.white)
-    c.setStrokeColor(colors.HexColor("#DDDDDD"))
+    c.setStrokeColor(BORDER_GRAY)
     c.setLineWidth(1)
     c.roundRect(
         35 * mm,
@@ -165,7 +241,7 @@ def generate_ticket_pdf(booking: GroupBooking):
     y_pos = content_start - 16 * mm
 
     # Group Name - CENTERED
-    c.setFillColor(text_light)
+    c.setFillColor(TEXT_LIGHT)
     c.setFont("Helvetica", 16)
     c.drawCentredString(width / 2, y_pos, "GROUP NAME:")
 
@@ -183,7 +259,7 @@ def generate_ticket_pdf(booking: GroupBooking):
     single_width = pdfmetrics.stringWidth(group_name, font_name, max_font)
     if single_width <= max_text_width:
         # Fits single line at max size -> draw it
-        c.setFillColor(text_dark)
+        c.setFillColor(TEXT_DARK)
         c.setFont(font_name, max_font)
         c.drawCentredString(width / 2, y_pos - 12 * mm, group_name)
     else:
@@ -200,7 +276,7 @@ def generate_ticket_pdf(booking: GroupBooking):
                     break
                 font_size -= step
             font_size = max(font_size, min_font)
-            c.setFillColor(text_dark)
+            c.setFillColor(TEXT_DARK)
             c.setFont(font_name, font_size)
             c.drawCentredString(width / 2, y_pos - 12 * mm, group_name)
         else:
@@ -230,7 +306,7 @@ def generate_ticket_pdf(booking: GroupBooking):
             font_size = max(font_size, min_font)
 
             # Draw the two lines, slightly above/below same position as before
-            c.setFillColor(text_dark)
+            c.setFillColor(TEXT_DARK)
             c.setFont(font_name, font_size)
             # adjust vertical offsets if you want different spacing
             c.drawCentredString(width / 2, y_pos - 10 * mm, line1)
@@ -238,39 +314,33 @@ def generate_ticket_pdf(booking: GroupBooking):
 
     # Visit Date - CENTERED
     y_pos -= 25 * mm
-    c.setFillColor(text_light)
+    c.setFillColor(TEXT_LIGHT)
     c.setFont("Helvetica", 16)
     c.drawCentredString(width / 2, y_pos - 6, "VISIT DATE:")
 
-    c.setFillColor(text_dark)
+    c.setFillColor(TEXT_DARK)
     c.setFont("Helvetica-Bold", 24)  # 1.4x larger (was 16)
 
     # Format date nicely
-    from datetime import datetime
-
-    try:
-        date_obj = datetime.strptime(str(booking.visit_date), "%Y-%m-%d")
-        formatted_date = date_obj.strftime("%A, %d %B %Y")
-    except Exception:
-        formatted_date = str(booking.visit_date)
+    formatted_date = format_long_date(booking.visit_date)
 
     c.drawCentredString(width / 2, y_pos - 15 * mm, formatted_date)
 
     # Barcode section with accent background
     y_pos -= 30 * mm
-    c.setFillColor(accent_color)
-    c.setStrokeColor(accent_color)
+    c.setFillColor(ACCENT_COLOR)
+    c.setStrokeColor(ACCENT_COLOR)
     c.roundRect(
         35 * mm, y_pos - 45 * mm, width - 70 * mm, 45 * mm, 3 * mm, fill=1, stroke=1
     )
 
     # Barcode label
-    c.setFillColor(text_white)
+    c.setFillColor(TEXT_WHITE)
     c.setFont("Helvetica-Bold", 14)
     c.drawCentredString(width / 2, y_pos - 7 * mm, "SCAN AT ENTRANCE")
 
     # Draw barcode
-    c.setFillColor(text_black)
+    c.setFillColor(TEXT_BLACK)
     barcode_value = booking.barcode
 
     # Increased barWidth significantly for wider barcode
@@ -289,13 +359,13 @@ def generate_ticket_pdf(booking: GroupBooking):
     barcode.drawOn(c, barcode_x, y_pos - 33 * mm)
 
     # Barcode number below
-    c.setFillColor(text_white)
+    c.setFillColor(TEXT_WHITE)
     c.setFont("Helvetica-Bold", 14)
     c.drawCentredString(width / 2, y_pos - 40 * mm, barcode_value)
 
     # Important notice box
     notice_y = content_start - 140 * mm
-    c.setStrokeColor(primary_color)
+    c.setStrokeColor(PRIMARY_COLOR)
     c.setLineWidth(2)
     c.setFillColor(colors.white)
     c.roundRect(
@@ -303,36 +373,29 @@ def generate_ticket_pdf(booking: GroupBooking):
     )
 
     # Notice icon and text
-    c.setFillColor(primary_color)
+    c.setFillColor(PRIMARY_COLOR)
     c.setFont("Helvetica-Bold", 11)
     c.drawString(35 * mm, notice_y - 10 * mm, "⚠  IMPORTANT INFORMATION")
 
-    c.setFillColor(text_dark)
+    c.setFillColor(TEXT_DARK)
     c.setFont("Helvetica", 9)
-    instructions = [
-        "• This ticket is valid for ONE VEHICLE entrance on the date shown above",
-        "• Driver must present this ticket at the entrance for scanning",
-        "• Entry is strictly in queue order - no priority entrance available",
-        "• No entry after 3:00 PM  •  Alcohol strictly prohibited  •  No music permitted",
-    ]
-
     inst_y = notice_y - 17 * mm
-    for instruction in instructions:
+    for instruction in INSTRUCTIONS:
         c.drawString(37 * mm, inst_y, instruction)
         inst_y -= 5 * mm
 
     # Footer section
-    footer_y = 35 * mm
+    footer_y = FOOTER_HEIGHT
 
     # Contact info box
-    c.setFillColor(accent_color)
+    c.setFillColor(ACCENT_COLOR)
     c.rect(0, 0, width, footer_y, fill=1, stroke=0)
 
-    c.setFillColor(text_white)
+    c.setFillColor(TEXT_WHITE)
     c.setFont("Helvetica-Bold", 17)
     c.drawCentredString(width / 2, 27 * mm, "The Farmyard Park (Pty) Ltd")
 
-    c.setFillColor(text_white)
+    c.setFillColor(TEXT_WHITE)
     c.setFont("Helvetica", 12)
     c.drawCentredString(width / 2, 20 * mm, "Protea Road, Klapmuts, Western Cape 7625")
     c.drawCentredString(
@@ -342,7 +405,7 @@ def generate_ticket_pdf(booking: GroupBooking):
     )
 
     c.setFont("Helvetica-Oblique", 12)
-    c.setFillColor(text_white)
+    c.setFillColor(TEXT_WHITE)
     c.drawCentredString(
         width / 2,
         5 * mm,
@@ -350,7 +413,7 @@ def generate_ticket_pdf(booking: GroupBooking):
     )
 
     # Subtle watermark
-    c.setFillColor(colors.Color(0.8, 0.8, 0.8, alpha=0.35))
+    c.setFillColor(WATERMARK_COLOR)
     c.setFont("Helvetica", 60)
     c.saveState()
     c.translate(width / 2 + 10, height - 330)
@@ -358,15 +421,8 @@ def generate_ticket_pdf(booking: GroupBooking):
     c.drawCentredString(0, 0, "VALID TICKET")
     c.restoreState()
 
-    # Finalize PDF
+    # Finalize page
     c.showPage()
-    c.save()
-
-    # Get PDF bytes
-    pdf_bytes = buffer.getvalue()
-    buffer.close()
-
-    return pdf_bytes
 
 
 def convert_pdf_to_jpeg(pdf_bytes: bytes) -> bytes:
@@ -379,27 +435,33 @@ def convert_pdf_to_jpeg(pdf_bytes: bytes) -> bytes:
     Returns:
         bytes: JPEG image as bytes
     """
+    # Imported here rather than at module level: PyMuPDF alone costs ~90ms and
+    # ~35MB to import, which only processes that actually rasterize need pay
+    import fitz
+    from PIL import Image
+
     try:
         # Open PDF from bytes
         pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
 
-        if len(pdf_document) == 0:
-            raise ValueError("PDF has no pages")
-
-        # Get the first page (tickets are single page)
-        page = pdf_document[0]
+        try:
+            if len(pdf_document) == 0:
+                raise ValueError("PDF has no pages")
 
-        # Render page to pixmap at reduced resolution to keep size <5MB
-        mat = fitz.Matrix(2.0, 2.0)
-        pix = page.get_pixmap(matrix=mat)
+            # Get the first page (tickets are single page)
+            page = pdf_document[0]
 
-        # Convert pixmap to PIL Image
-        img_data = pix.tobytes("png")
-        img: Image.Image = Image.open(BytesIO(img_data))
+            # Render page to an RGB pixmap at reduced resolution to keep
+            # size <5MB (alpha=False, so no RGBA->RGB conversion is needed)
+            mat = fitz.Matrix(2.0, 2.0)
+            pix = page.get_pixmap(matrix=mat, alpha=False)
+        finally:
+            # Close the PDF document
+            pdf_document.close()
 
-        # Convert to RGB if needed (some PDFs may be in RGBA)
-        if img.mode != "RGB":
-            img = img.convert("RGB")
+        # Hand the raw samples to PIL directly rather than encoding a PNG
+        # only to decode it again
+        img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
 
         # Save to BytesIO as JPEG with reduced quality
         jpeg_buffer = BytesIO()
@@ -414,13 +476,10 @@ def convert_pdf_to_jpeg(pdf_bytes: bytes) -> bytes:
         jpeg_bytes = jpeg_buffer.getvalue()
         jpeg_buffer.close()
 
-        # Close the PDF document
-        pdf_document.close()
-
         return jpeg_bytes
 
     except Exception as e:
-        print(f"Error converting PDF to JPEG: {e}")
+        logger.error("Error converting PDF to JPEG: %s", e)
         raise
 
 
@@ -428,6 +487,9 @@ def get_ticket_image_bytes(booking):
     """
     Generate ticket PDF and convert to JPEG image
 
+    Like the PDFs, converted images are cached per process on the fields
+    drawn on the ticket, so re-sends and retries skip rasterizing.
+
     Args:
         booking: Dict with keys: group_name, visit_date, barcode
 
@@ -435,4 +497,9 @@ def get_ticket_image_bytes(booking):
         bytes: JPEG image as bytes
     """
 
-    return convert_pdf_to_jpeg(generate_ticket_pdf(booking))
+    return _render_ticket_jpeg(*_ticket_key(booking))
+
+
+@functools.lru_cache(maxsize=64)
+def _render_ticket_jpeg(barcode, group_name, visit_date):
+    return convert_pdf_to_jpeg(_render_ticket_pdf(barcode, group_name, visit_date))
@@ -1,7 +1,22 @@
-from datetime import datetime
+import functools
+from datetime import date, datetime
 from zoneinfo import ZoneInfo
 
 
 def get_today():
     """Get current date in Johannesburg timezone."""
     return datetime.now(ZoneInfo("Africa/Johannesburg")).date()
+
+
+@functools.lru_cache(maxsize=512)
+def format_long_date(value) -> str:
+    """
+    Format a visit date (date or "YYYY-MM-DD") as e.g. "Monday, 20 October 2026".
+
+    Cached, as bookings cluster on a handful of visit dates. Values that
+    aren't ISO dates are returned as str unchanged.
+    """
+    try:
+        return date.fromisoformat(str(value)).strftime("%A, %d %B %Y")
+    except ValueError:
+        return str(value)
@@ -0,0 +1,24 @@
+import functools
+
+import phonenumbers
+
+
+def za_national(e164: str) -> str:
+    """
+    Format a normalized number ("27821234567") in ZA national format.
+
+    ZA numbers are grouped "0XX XXX XXXX", so this is done with plain string
+    slicing. The 0860 share-call range (grouped "0860 XXX XXX") and non-ZA
+    numbers fall back to phonenumbers.
+    """
+    if len(e164) == 11 and e164.startswith("27") and not e164.startswith("27860"):
+        if e164.isdigit():
+            return f"0{e164[2:4]} {e164[4:7]} {e164[7:11]}"
+
+    return _national_format(e164)
+
+
+@functools.lru_cache(maxsize=4096)
+def _national_format(e164: str) -> str:
+    parsed = phonenumbers.parse(e164, "ZA")
+    return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.NATIONAL)
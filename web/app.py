@@ -1,20 +1,40 @@
+import phonenumbers
 from flask import Flask, render_template
 
 from web.config import Config
 from web.routes import scripts as scripts_routes
 from web.routes.api import api_bp
-from web.routes.groups import groups_bp
+from web.routes.groups import get_messaging_service, groups_bp
 from web.routes.open_tickets import open_tickets_bp
+from web.utils.json_provider import ORJSONProvider
+
+
+def warm_phonenumbers():
+    """
+    Force phonenumbers to load its ZA region metadata.
+
+    The library loads metadata lazily on first use, so without this the
+    first booking handled by each worker pays the load cost. Formatting in
+    NATIONAL too compiles the ZA number-format patterns used for display.
+    """
+    parsed = phonenumbers.parse("+27821234567", "ZA")
+    phonenumbers.is_valid_number(parsed)
+    phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+    phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.NATIONAL)
 
 
 def create_app(config_class=Config):
     """Application factory pattern"""
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = ORJSONProvider(app)
 
     # Ensure PDF directory exists
     app.config["PDF_OUTPUT_DIR"].mkdir(parents=True, exist_ok=True)
 
+    # Shared messaging service, so its HTTP session is reused across requests
+    app.extensions["messaging"] = get_messaging_service()
+
     # Register blueprints
     app.register_blueprint(api_bp, url_prefix="/api")
     app.register_blueprint(groups_bp)
@@ -23,6 +43,8 @@ def create_app(config_class=Config):
 
     app.register_blueprint(scripts_routes.bp)
 
+    warm_phonenumbers()
+
     # Root route
     @app.route("/")
     def home():
@@ -1,13 +1,17 @@
+from io import BytesIO
+
 from flask import (
     Blueprint,
     Response,
     abort,
+    current_app,
     flash,
+    g,
     jsonify,
-    make_response,
     redirect,
     render_template,
     request,
+    send_file,
     url_for,
 )
 
@@ -20,13 +24,40 @@ from config.settings import (
 from src.clients.chatwoot import ChatwootClient
 from src.models.group_booking import GroupBooking
 from src.services.chatwoot import ChatwootService
-from src.services.pdf import generate_ticket_pdf, get_ticket_image_bytes
+from src.services.pdf import (
+    generate_ticket_pdf,
+    get_ticket_image_bytes,
+    ticket_etag,
+)
 from src.services.token import TokenService
 from src.utils.logging import setup_logger
 
 logger = setup_logger("groups_routes")
 groups_bp = Blueprint("groups", __name__, url_prefix="/group-bookings")
 
+# Flash messages, formatted only on the branch that uses them
+_MSG_CREATED_SENT = (
+    "Group booking created successfully! Barcode: {barcode}. "
+    "Ticket sent via WhatsApp to {mobile}."
+)
+_MSG_CREATED_NOT_SENT = (
+    "Group booking created successfully! Barcode: {barcode}. "
+    "However, ticket could not be sent via WhatsApp: {error}. "
+    "Please download and send manually."
+)
+_MSG_UPDATED_SENT = (
+    'Booking for "{group_name}" has been updated successfully! '
+    "New ticket sent via WhatsApp to {mobile}."
+)
+_MSG_UPDATED_NOT_SENT = (
+    'Booking for "{group_name}" has been updated successfully! '
+    "However, the new ticket could not be sent via WhatsApp: {error}. "
+    "Please download and send manually."
+)
+_MSG_UPDATED = "Booking for {group_name} has been updated successfully"
+_MSG_DELETED = 'Booking for "{group_name}" has been deleted successfully!'
+_MSG_TICKET_SENT = "Ticket sent successfully to {mobile}"
+
 
 def get_booking_form_data(request):
     """Extract booking form data from request"""
@@ -39,6 +70,18 @@ def get_booking_form_data(request):
     return booking_id, group_name, contact_person, mobile_number, visit_date
 
 
+def _bookings():
+    """Formatted bookings for the table, queried at most once per request."""
+    if "formatted_bookings" not in g:
+        g.formatted_bookings = GroupBooking.get_formatted()
+    return g.formatted_bookings
+
+
+def _render_bookings():
+    """Render the bookings page (used by the form error paths)."""
+    return render_template("group_bookings.html", bookings=_bookings())
+
+
 def get_messaging_service():
     """
     Factory function to get the configured messaging service.
@@ -64,14 +107,29 @@ def get_messaging_service():
     return ChatwootService(client=client, inbox_id=inbox_id)
 
 
-messaging_service = get_messaging_service()
+def _ticket_image_url(barcode):
+    """Build the signed, external ticket image URL (needs a request context)."""
+    token = TokenService.generate_ticket_image_token(barcode)
+    return url_for(
+        "groups.get_ticket_image", barcode=barcode, token=token, _external=True
+    )
+
+
+def _send_ticket(booking):
+    """Send a booking's ticket via WhatsApp and return the service result."""
+    return current_app.extensions["messaging"].send_group_vehicle_ticket_jpeg(
+        to_number=booking.mobile_number,
+        booking=booking,
+        image_url=_ticket_image_url(booking.barcode),
+        inbox_id=CHATWOOT_INBOX_ID,
+    )
 
 
 @groups_bp.route("/", methods=["GET"])
 def manage_bookings():
     """Display form and table for group bookings"""
 
-    return render_template("group_bookings.html", bookings=GroupBooking.get_formatted())
+    return _render_bookings()
 
 
 @groups_bp.route("/create", methods=["POST"])
@@ -89,36 +147,20 @@ def create():
         )
 
         if booking.id:
-            token = TokenService.generate_ticket_image_token(booking.barcode)
-
-            image_url = url_for(
-                "groups.get_ticket_image",
-                barcode=booking.barcode,
-                token=token,
-                _external=True,
-            )
+            result = _send_ticket(booking)
 
-            result = messaging_service.send_group_vehicle_ticket_jpeg(
-                to_number=booking.mobile_number,
-                booking=booking,
-                image_url=image_url,
-                inbox_id=CHATWOOT_INBOX_ID,
-            )
-
-            send_success = result.get("success", False)
-            error = result.get("error")
-
-            if send_success:
+            if result.get("success", False):
                 flash(
-                    f"Group booking created successfully! Barcode: {booking.barcode}. "
-                    f"Ticket sent via WhatsApp to {booking.mobile_number}.",
+                    _MSG_CREATED_SENT.format(
+                        barcode=booking.barcode, mobile=booking.mobile_number
+                    ),
                     "success",
                 )
             else:
                 flash(
-                    f"Group booking created successfully! Barcode: {booking.barcode}. "
-                    f"However, ticket could not be sent via WhatsApp: {error}. "
-                    f"Please download and send manually.",
+                    _MSG_CREATED_NOT_SENT.format(
+                        barcode=booking.barcode, error=result.get("error")
+                    ),
                     "warning",
                 )
         else:
@@ -126,9 +168,7 @@ def create():
 
     except ValueError as e:
         flash(str(e), "error")
-        return render_template(
-            "group_bookings.html", bookings=GroupBooking.get_formatted()
-        ), 400
+        return _render_bookings(), 400
 
     return redirect(url_for("groups.manage_bookings"))
 
@@ -141,16 +181,12 @@ def update():
 
     if not booking_id:
         flash("Booking ID is required for update!", "error")
-        return render_template(
-            "group_bookings.html", bookings=GroupBooking.get_formatted()
-        ), 400
+        return _render_bookings(), 400
 
     existing_booking = GroupBooking.get_by_id(booking_id)
     if not existing_booking:
         flash("Booking not found!", "error")
-        return render_template(
-            "group_bookings.html", bookings=GroupBooking.get_formatted()
-        ), 404
+        return _render_bookings(), 404
 
     try:
         requires_new_ticket = existing_booking.requires_new_ticket(
@@ -169,49 +205,28 @@ def update():
             return redirect(url_for("groups.manage_bookings"))
 
         if requires_new_ticket:
-            token = TokenService.generate_ticket_image_token(updated_booking.barcode)
-
-            image_url = url_for(
-                "groups.get_ticket_image",
-                barcode=updated_booking.barcode,
-                token=token,
-                _external=True,
-            )
+            result = _send_ticket(updated_booking)
 
-            result = messaging_service.send_group_vehicle_ticket_jpeg(
-                to_number=updated_booking.mobile_number,
-                booking=updated_booking,
-                image_url=image_url,
-                inbox_id=CHATWOOT_INBOX_ID,
-            )
-
-            send_success = result.get("success", False)
-            error = result.get("error")
-
-            if send_success:
+            if result.get("success", False):
                 flash(
-                    f'Booking for "{group_name}" has been updated successfully! '
-                    f"New ticket sent via WhatsApp to {updated_booking.mobile_number}.",
+                    _MSG_UPDATED_SENT.format(
+                        group_name=group_name, mobile=updated_booking.mobile_number
+                    ),
                     "success",
                 )
             else:
                 flash(
-                    f'Booking for "{group_name}" has been updated successfully! '
-                    f"However, the new ticket could not be sent via WhatsApp: {error}. "
-                    f"Please download and send manually.",
+                    _MSG_UPDATED_NOT_SENT.format(
+                        group_name=group_name, error=result.get("error")
+                    ),
                     "warning",
                 )
         else:
-            flash(
-                f"Booking for {group_name} has been updated successfully",
-                "success",
-            )
+            flash(_MSG_UPDATED.format(group_name=group_name), "success")
 
     except ValueError as e:
         flash(str(e), "error")
-        return render_template(
-            "group_bookings.html", bookings=GroupBooking.get_formatted()
-        ), 400
+        return _render_bookings(), 400
 
     return redirect(url_for("groups.manage_bookings"))
 
@@ -236,13 +251,42 @@ def delete_booking():
     success = GroupBooking.delete(booking_id)
 
     if success:
-        flash(f'Booking for "{group_name}" has been deleted successfully!', "success")
+        flash(_MSG_DELETED.format(group_name=group_name), "success")
     else:
         flash("Error deleting booking", "error")
 
     return redirect(url_for("groups.manage_bookings"))
 
 
+def _ticket_pdf_response(booking, as_attachment):
+    """
+    Serve a booking's ticket PDF, answering repeat fetches with 304.
+
+    The ETag comes from the fields printed on the ticket, so revalidation
+    is answered before any rendering, and an edited booking gets a new one.
+    Updates keep the barcode, so the ticket is not cacheable as immutable;
+    browsers revalidate on every fetch instead.
+    """
+    etag = ticket_etag(booking)
+
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+        response.cache_control.max_age = 0
+        return response
+
+    return send_file(
+        BytesIO(generate_ticket_pdf(booking)),
+        mimetype="application/pdf",
+        as_attachment=as_attachment,
+        download_name=f"ticket_{booking.barcode}.pdf",
+        etag=etag,
+        conditional=True,
+        max_age=0,
+    )
+
+
 @groups_bp.route("/ticket/<barcode>")
 def view_ticket(barcode):
     """View PDF ticket in browser"""
@@ -252,13 +296,7 @@ def view_ticket(barcode):
         flash("Booking not found", "error")
         return redirect(url_for("groups.manage_bookings"))
 
-    pdf_bytes = generate_ticket_pdf(booking)
-
-    response = make_response(pdf_bytes)
-    response.headers["Content-Type"] = "application/pdf"
-    response.headers["Content-Disposition"] = f"inline; filename=ticket_{barcode}.pdf"
-
-    return response
+    return _ticket_pdf_response(booking, as_attachment=False)
 
 
 @groups_bp.route("/download/<barcode>")
@@ -270,15 +308,7 @@ def download_ticket(barcode):
         flash("Booking not found", "error")
         return redirect(url_for("groups.manage_bookings"))
 
-    pdf_bytes = generate_ticket_pdf(booking)
-
-    response = make_response(pdf_bytes)
-    response.headers["Content-Type"] = "application/pdf"
-    response.headers["Content-Disposition"] = (
-        f"attachment; filename=ticket_{barcode}.pdf"
-    )
-
-    return response
+    return _ticket_pdf_response(booking, as_attachment=True)
 
 
 @groups_bp.route("/ticket/image/<barcode>")
@@ -301,7 +331,7 @@ def get_ticket_image(barcode: str):
     token = request.args.get("token")
 
     if not token:
-        logger.warning(f"Ticket image request without token for barcode: {barcode}")
+        logger.warning("Ticket image request without token for barcode: %s", barcode)
         abort(403)
 
     # Verify JWT token
@@ -309,19 +339,19 @@ def get_ticket_image(barcode: str):
 
     if not is_valid:
         if error == "expired":
-            logger.warning(f"Expired token for barcode: {barcode}")
+            logger.warning("Expired token for barcode: %s", barcode)
             abort(410)  # Gone - token expired
         elif error == "mismatch":
-            logger.warning(f"Token barcode mismatch for barcode: {barcode}")
+            logger.warning("Token barcode mismatch for barcode: %s", barcode)
             abort(403)  # Forbidden - wrong barcode
         else:
-            logger.warning(f"Invalid token for barcode: {barcode}, error: {error}")
+            logger.warning("Invalid token for barcode: %s, error: %s", barcode, error)
             abort(403)  # Forbidden - invalid token
 
     # Fetch booking from database
     booking = GroupBooking.get_by_barcode(barcode)
     if not booking:
-        logger.warning(f"Booking not found for barcode: {barcode}")
+        logger.warning("Booking not found for barcode: %s", barcode)
         abort(404)
 
     try:
@@ -336,12 +366,14 @@ def get_ticket_image(barcode: str):
         response.headers["Pragma"] = "no-cache"
         response.headers["Expires"] = "0"
 
-        logger.info(f"Successfully served ticket image for barcode: {barcode}")
+        logger.info("Successfully served ticket image for barcode: %s", barcode)
         return response
 
     except Exception as e:
         logger.error(
-            f"Error generating ticket image for barcode {barcode}: {str(e)}",
+            "Error generating ticket image for barcode %s: %s",
+            barcode,
+            e,
             exc_info=True,
         )
         abort(500)
@@ -362,36 +394,27 @@ def send_whatsapp_ticket():
         if not booking:
             return jsonify({"success": False, "error": "Booking not found"}), 404
 
-        token = TokenService.generate_ticket_image_token(barcode)
-
-        image_url = url_for(
-            "groups.get_ticket_image", barcode=barcode, token=token, _external=True
-        )
-
-        result = messaging_service.send_group_vehicle_ticket_jpeg(
-            to_number=booking.mobile_number,
-            booking=booking,
-            image_url=image_url,
-            inbox_id=CHATWOOT_INBOX_ID,
-        )
+        result = _send_ticket(booking)
 
         send_success = result.get("success", False)
         error = result.get("error")
 
         if send_success:
             logger.info(
-                f"Manually sent WhatsApp ticket for barcode {barcode} to {booking.mobile_number}"
+                "Manually sent WhatsApp ticket for barcode %s to %s",
+                barcode,
+                booking.mobile_number,
             )
             return jsonify(
                 {
                     "success": True,
-                    "message": f"Ticket sent successfully to {booking.mobile_number}",
+                    "message": _MSG_TICKET_SENT.format(mobile=booking.mobile_number),
                 }
             ), 200
         else:
-            logger.error(f"Failed to send WhatsApp ticket: {error}")
+            logger.error("Failed to send WhatsApp ticket: %s", error)
             return jsonify({"success": False, "error": error or "Unknown error"}), 500
 
     except Exception as e:
-        logger.error(f"Exception in send_whatsapp_ticket: {str(e)}", exc_info=True)
+        logger.error("Exception in send_whatsapp_ticket: %s", e, exc_info=True)
         return jsonify({"success": False, "error": str(e)}), 500
@@ -1,26 +1,37 @@
 from datetime import datetime
 
-from flask import Blueprint, jsonify, request
+import orjson
+from flask import Blueprint, Response, request
 
 from src.models.open_ticket import OpenTicket
 
 open_tickets_bp = Blueprint("open_tickets", __name__)
 
+# Constant acknowledgement body, serialized once at import
+_OK_BODY = orjson.dumps({"status": "ok"})
+
+
+def _ok():
+    return Response(_OK_BODY, mimetype="application/json")
+
 
 @open_tickets_bp.route("/open_tickets/events", methods=["POST"])
 def open_ticket_events():
     payload = request.get_json(force=True)
-    events = payload.get("events", [])
 
-    for evt in events:
-        OpenTicket.upsert_open(
-            ticket_id=evt["ticket_id"],
-            semantic_hash=evt["semantic_hash"],
-            receipt_json=evt["receipt"],
-            observed_at=datetime.fromtimestamp(evt["observed_at"] / 1000),
-        )
+    events = [
+        {
+            "ticket_id": evt["ticket_id"],
+            "semantic_hash": evt["semantic_hash"],
+            "receipt_json": evt["receipt"],
+            "observed_at": datetime.fromtimestamp(evt["observed_at"] / 1000),
+        }
+        for evt in payload.get("events", [])
+    ]
+
+    OpenTicket.bulk_upsert_open(events)
 
-    return jsonify({"status": "ok"})
+    return _ok()
 
 
 @open_tickets_bp.route("/open_tickets/heartbeat", methods=["POST"])
@@ -32,4 +43,4 @@ def open_ticket_heartbeat():
 
     OpenTicket.close_missing(open_ids, observed_at)
 
-    return jsonify({"status": "ok"})
+    return _ok()
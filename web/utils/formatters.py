@@ -1,13 +1,21 @@
-from datetime import datetime
+import re
+
+# Loyverse timestamps, e.g. "2025-10-01T08:15:30.000Z". Checked with a
+# precompiled pattern and then sliced, which is much cheaper than strptime.
+_ISO_UTC_RE = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{1,6}Z")
+
+
+def _check_iso_utc(date_string: str) -> str:
+    if not _ISO_UTC_RE.fullmatch(date_string):
+        raise ValueError(f"Invalid ISO datetime: {date_string!r}")
+    return date_string
 
 
 def format_date(date_string: str) -> str:
     """Convert ISO datetime to date string (YYYY-MM-DD)"""
-    parsed_date = datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%S.%fZ")
-    return parsed_date.strftime("%Y-%m-%d")
+    return _check_iso_utc(date_string)[:10]
 
 
 def format_time(date_string: str) -> str:
     """Convert ISO datetime to time string (HH:MM:SS)"""
-    parsed_date = datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%S.%fZ")
-    return parsed_date.strftime("%H:%M:%S")
+    return _check_iso_utc(date_string)[11:19]
@@ -0,0 +1,26 @@
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    Used for request.get_json() and jsonify(). Dates are passed through to
+    DefaultJSONProvider.default so they keep Flask's HTTP date format, as do
+    other types orjson can't serialize natively (e.g. Decimal).
+    """
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(
+            obj, default=kwargs.get("default", self.default), option=option
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
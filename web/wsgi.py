@@ -7,20 +7,24 @@ For PythonAnywhere:
     Point your WSGI configuration to this file.
 
 For local testing with Gunicorn:
-    gunicorn web.wsgi:application
+    gunicorn --preload web.wsgi:application
+
+    --preload builds the app once in the master process so workers share
+    the imported modules and warmed-up metadata via copy-on-write.
 """
 
 import sys
 from pathlib import Path
 
-from web.app import create_app
-
 # Add the project directory to the Python path
-# This ensures imports work correctly in production
+# This ensures imports work correctly in production (it must happen before
+# the project imports below, or they can't be resolved)
 project_home = Path(__file__).resolve().parent.parent
 if str(project_home) not in sys.path:
     sys.path.insert(0, str(project_home))
 
+from web.app import create_app  # noqa: E402
+
 # Create the application instance
 application = create_app()
 